@@ -1,6 +1,9 @@
 """Configuration options"""
 
 
+import os
+import sys
+
 import torch
 
 from dlkoopman.utils import is_torch_2
@@ -9,6 +12,13 @@ __pdoc__ = {
     'ConfigValidationError': False
 }
 
+if (
+    is_torch_2() and not torch.__version__.startswith('2.0') # expandable segments are not recognized in torch < 2.1
+    and sys.platform.startswith('linux') # expandable segments are not supported on other platforms, where setting them triggers a warning
+    and 'PYTORCH_CUDA_ALLOC_CONF' not in os.environ and 'PYTORCH_ALLOC_CONF' not in os.environ # never override a user-provided allocator config under either name
+):
+    os.environ['PYTORCH_CUDA_ALLOC_CONF'] = 'expandable_segments:True' # reduce CUDA caching allocator fragmentation across repeated runs such as hyperparameter searches. Only takes effect if CUDA has not been initialized yet.
+
 
 class ConfigValidationError(Exception):
     """Raised when config does not validate."""
@@ -46,6 +56,9 @@ class Config():
     - **CTYPE** (*torch.dtype*) - Data type of complex tensors. Is automatically set to `torch.c<precision>` (e.g. `torch.cfloat` if `precision="float"`).
 
     - **DEVICE** (*torch.device*) - Device where tensors reside. Is automatically set to `"cpu"` if `use_cuda=False` or CuDA is not available, otherwise `"cuda"`.
+
+    ## Effects
+    Importing this module sets the environment variable `PYTORCH_CUDA_ALLOC_CONF="expandable_segments:True"` to reduce fragmentation of GPU memory across repeated runs (e.g. in hyperparameter searches). This is a process-wide setting, which is also inherited by subprocesses. It is only done on Linux with `torch >= 2.1`, and only if neither `PYTORCH_CUDA_ALLOC_CONF` nor `PYTORCH_ALLOC_CONF` is already set. Set either of them before importing DLKoopman to use a different allocator configuration. The setting has no effect if CuDA was already initialized before importing DLKoopman.
     """
     
     def __init__(self,
@@ -32,8 +32,44 @@ def anae(ref, new) -> torch.Tensor:
     ## Returns
     **anae** (*torch scalar*) - In percentage.
     """
-    ret = torch.abs(ref-new)/torch.abs(ref)
-    return 100.*torch.mean(ret[ret!=torch.inf])
+    return _anae_precomputed(ref, new, *_anae_ref_terms(ref))
+
+def _anae_ref_terms(ref) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+    """ Terms of ANAE which only depend on `ref`, so that they can be shared across multiple ANAE computations with the same `ref`. """
+    abs_ref = torch.abs(ref)
+    mask = abs_ref != 0
+    return torch.where(mask, abs_ref, torch.ones_like(abs_ref)), mask, mask.sum() # safe denominator only for ignored entries, so that tiny nonzero values are normalized exactly
+
+def _anae_precomputed(ref, new, denom, mask, count) -> torch.Tensor:
+    ret = torch.abs(ref-new)/denom
+    ret = torch.where(mask, ret, torch.zeros_like(ret)) # zero out ignored entries instead of compacting them out via boolean indexing
+    acc_dtype = torch.promote_types(ret.dtype, torch.float) # accumulate half precision sums in float, since they overflow quickly
+    return (100.*ret.sum(dtype=acc_dtype)/count).to(ret.dtype)
+
+
+def anae_fast(ref, new, eps=None) -> torch.Tensor:
+    """Fast approximate [ANAE](https://galoisinc.github.io/dlkoopman/metrics.html#dlkoopman.metrics.anae), computed as a single elementwise pass and mean without any masking.
+
+    Instead of ignoring ground truth values of \\(0\\), every absolute ground truth is floored at `eps` before normalizing. Hence:
+
+    - If `ref` has no zeros (and no absolute values below `eps`), the result is identical to `anae`.
+
+    - Otherwise the result is biased. Zero ground truth values where `new` is also \\(0\\) contribute \\(0\\) and pull the average down, while zero ground truth values where `new` is not \\(0\\) contribute \\(|new|/\\text{eps}\\), which is huge for small `eps`.
+
+    Use this when `ref` is known to not contain zeros, otherwise stick with `anae`.
+
+    ## Parameters
+    - **ref** (*torch.Tensor*) and **new** (*torch.Tensor*) - Error will be calculated between these tensors. If `ref` is not floating point, it is converted to the default floating point data type before computing.
+
+    - **eps** (*float, optional*) - Floor for absolute ground truth values. Defaults to the smallest positive normal number of the (floating point) data type of `ref`.
+
+    ## Returns
+    **anae** (*torch scalar*) - In percentage.
+    """
+    if not ref.is_floating_point():
+        ref = ref.to(torch.get_default_dtype())
+    denom = torch.abs(ref).clamp_min(torch.finfo(ref.dtype).tiny if eps is None else eps)
+    return 100.*torch.mean(torch.abs(ref-new)/denom)
 
 
 def overall_anae(X, Y, Xr, Ypred, Xpred) -> dict[str, torch.Tensor]:
@@ -57,10 +93,11 @@ def overall_anae(X, Y, Xr, Ypred, Xpred) -> dict[str, torch.Tensor]:
     - Key **'lin'**: (*torch scalar*) - Linearity ANAE between `Y` and `Ypred`.
     - Key **'pred'**: (*torch scalar*) - Prediction ANAE between `X` and `Xpred`.
     """
+    X_terms = _anae_ref_terms(X) # shared by 'recon' and 'pred'
     return {
-        'recon': anae(ref=X, new=Xr),
+        'recon': _anae_precomputed(X, Xr, *X_terms),
         'lin': anae(ref=Y, new=Ypred),
-        'pred': anae(ref=X, new=Xpred)
+        'pred': _anae_precomputed(X, Xpred, *X_terms)
     }
 
 
@@ -19,6 +19,7 @@ from dlkoopman.config import Config
 warnings.filterwarnings("ignore", category=UserWarning)
 
 __pdoc__ = {
+    'StatePredDataHandler.dts': False,
     'StatePred.decoder_loss_weight': False,
     'StatePred.cond_threshold': False,
     'StatePred.Omega': False,
@@ -27,6 +28,19 @@ __pdoc__ = {
 }
 
 
+def _index_diffs_histogram(t) -> tuple[torch.Tensor, torch.Tensor]:
+    """ Given a 1D tensor of indexes, return the unique differences between consecutive indexes and their frequencies, ordered by first occurrence. Runs on the device of `t`. """
+    vals, inverse, counts = torch.unique(t[1:]-t[:-1], return_inverse=True, return_counts=True)
+    first_idxs = torch.full_like(counts, len(inverse)).scatter_reduce_(0, inverse, torch.arange(len(inverse), device=t.device), reduce='amin')
+    order = torch.argsort(first_idxs)
+    return vals[order], counts[order]
+
+
+def _normalize_t(t, shift, scale) -> torch.Tensor:
+    """ Shift and scale indexes with a single allocation. The subtraction creates a new tensor, so the in-place division never touches the caller's data. """
+    return t.sub(shift).div_(scale)
+
+
 class StatePredDataHandler:
     """State predictor data handler. Used to provide data to train (and optionally validate and test) the `StatePred` model.
 
@@ -83,48 +97,57 @@ class StatePredDataHandler:
 
     def __init__(self, Xtr, ttr, Xva=None, tva=None, Xte=None, tte=None, cfg=None):
         self.cfg = Config() if cfg is None else cfg
-        self.Xtr = utils.tensorize(Xtr, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        self.Xva = utils.tensorize(Xva, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        self.Xte = utils.tensorize(Xte, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        self.ttr = utils.tensorize(ttr, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        self.tva = utils.tensorize(tva, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        self.tte = utils.tensorize(tte, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
+
+        ## Stage host data on the CPU first (tensors already on CuDA stay there), so that the reductions below run next to the source buffers instead of requiring device->host syncs
+        self.Xtr = utils.tensorize(Xtr, dtype=self.cfg.RTYPE, device=utils.staging_device(Xtr, self.cfg.DEVICE))
+        self.Xva = utils.tensorize(Xva, dtype=self.cfg.RTYPE, device=utils.staging_device(Xva, self.cfg.DEVICE))
+        self.Xte = utils.tensorize(Xte, dtype=self.cfg.RTYPE, device=utils.staging_device(Xte, self.cfg.DEVICE))
+        self.ttr = utils.tensorize(ttr, dtype=self.cfg.RTYPE, device=utils.staging_device(ttr, self.cfg.DEVICE))
+        self.tva = utils.tensorize(tva, dtype=self.cfg.RTYPE, device=utils.staging_device(tva, self.cfg.DEVICE))
+        self.tte = utils.tensorize(tte, dtype=self.cfg.RTYPE, device=utils.staging_device(tte, self.cfg.DEVICE))
 
         ## Check sizes
         assert len(self.Xtr) == len(self.ttr), f"Expected 'Xtr' and 'ttr' to have same length of 1st dimension, instead found {len(self.Xtr)} and {len(self.ttr)}"
         assert len(self.Xva) == len(self.tva), f"Expected 'Xva' and 'tva' to have same length of 1st dimension, instead found {len(self.Xva)} and {len(self.tva)}"
         assert len(self.Xte) == len(self.tte), f"Expected 'Xte' and 'tte' to have same length of 1st dimension, instead found {len(self.Xte)} and {len(self.tte)}"
 
-        ## Define Xscale, and normalize X data if applicable
-        self.Xscale = torch.max(torch.abs(self.Xtr)).item()
-        if self.cfg.normalize_Xdata:
-            self.Xtr = utils.scale(self.Xtr, scale=self.Xscale)
-            self.Xva = utils.scale(self.Xva, scale=self.Xscale)
-            self.Xte = utils.scale(self.Xte, scale=self.Xscale)
+        ## Define Xscale as the maximum absolute value in training data, computed as a single fused reduction
+        self.Xscale = torch.linalg.vector_norm(self.Xtr, ord=float('inf')).item()
+
+        ## Ensure that there are at least 2 training indexes, since the spacing between them is needed
+        if len(self.ttr) < 2:
+            raise ValueError(f"Expected at least 2 training indexes to determine their spacing, instead found {len(self.ttr)}. Please check 'ttr' = {ttr}")
 
-        ## Shift t data to make ttr start from 0 if it doesn't
+        ## Define t shift to make ttr start from 0 if it doesn't
         self.tshift = self.ttr[0].item()
-        self.ttr = utils.shift(self.ttr, shift=self.tshift)
-        self.tva = utils.shift(self.tva, shift=self.tshift)
-        self.tte = utils.shift(self.tte, shift=self.tshift)
-
-        ## Find differences between ttr values
-        self.dts = defaultdict(int) # define this as a class attribute because it will be accessed outside for writing to log file
-        for i in range(len(self.ttr)-1):
-            self.dts[self.ttr[i+1].item()-self.ttr[i].item()] += 1
-
-        ## Define t scale as most common difference between ttr values, and normalize t data by it
-        self.tscale = max(self.dts, key=self.dts.get)
-        self.ttr = utils.scale(self.ttr, scale=self.tscale)
-        self.tva = utils.scale(self.tva, scale=self.tscale)
-        self.tte = utils.scale(self.tte, scale=self.tscale)
-
-        ## Ensure that ttr now goes as [0,1,2,...], i.e. no gaps
-        self.ttr = torch.round(self.ttr)
-        dts_set = set(self.ttr[i+1].item()-self.ttr[i].item() for i in range(len(self.ttr)-1))
-        if dts_set != {1}:
+
+        ## Find differences between ttr values (these do not depend on the shift)
+        self._dts_vals, self._dts_counts = _index_diffs_histogram(self.ttr) # only materialized as a dict by `dts` when writing to log file
+
+        ## Define t scale as most common difference between ttr values (ties broken by first occurrence)
+        self.tscale = self._dts_vals[self._dts_counts.argmax()].item()
+
+        ## Shift and scale t data
+        self.ttr = _normalize_t(self.ttr, shift=self.tshift, scale=self.tscale)
+        self.tva = _normalize_t(self.tva, shift=self.tshift, scale=self.tscale)
+        self.tte = _normalize_t(self.tte, shift=self.tshift, scale=self.tscale)
+
+        ## Ensure that ttr now goes as [0,1,2,...], i.e. no gaps. Compare as integers so that the check is exact.
+        if not torch.equal(torch.round(self.ttr).long(), torch.arange(len(self.ttr), device=self.ttr.device)):
             raise ValueError(f"Training indexes are not equally spaced and cannot be rounded to get equal spacing. Please check 'ttr' = {ttr}")
 
+        ## Move X data to device in a single buffer, and normalize it there if applicable
+        self.Xtr, self.Xva, self.Xte = utils.to_single_buffer([self.Xtr, self.Xva, self.Xte], device=self.cfg.DEVICE, scale=self.Xscale if self.cfg.normalize_Xdata else None)
+
+        ## Move t data to device
+        self.ttr = torch.arange(len(self.ttr), dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
+        self.tva = utils.tensorize(self.tva, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
+        self.tte = utils.tensorize(self.tte, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
+
+    @property
+    def dts(self):
+        return dict(zip(self._dts_vals.tolist(), self._dts_counts.tolist()))
+
 
 class StatePred:
     """State predictor. Used to train on given states of a system at given indexes, then predict unknown states of the system at new indexes.
@@ -577,8 +600,7 @@ class StatePred:
         **Xpred** (*torch.Tensor, shape=(len(t), input_size)*) - Predicted states for the new indexes.
         """
         _t = utils.tensorize(t, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        _t = utils.shift(_t, shift=self.dh.tshift)
-        _t = utils.scale(_t, scale=self.dh.tscale)
+        _t = _normalize_t(_t, shift=self.dh.tshift, scale=self.dh.tscale)
 
         self.ae.eval()
         with torch.no_grad():
@@ -83,9 +83,11 @@ class TrajPredDataHandler:
 
     def __init__(self, Xtr, Xva=None, Xte=None, cfg=None):
         self.cfg = Config() if cfg is None else cfg
-        self.Xtr = utils.tensorize(Xtr, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        self.Xva = utils.tensorize(Xva, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
-        self.Xte = utils.tensorize(Xte, dtype=self.cfg.RTYPE, device=self.cfg.DEVICE)
+
+        ## Stage host data on the CPU first (tensors already on CuDA stay there), so that Xscale is computed next to the source buffers instead of requiring a device->host sync
+        self.Xtr = utils.tensorize(Xtr, dtype=self.cfg.RTYPE, device=utils.staging_device(Xtr, self.cfg.DEVICE))
+        self.Xva = utils.tensorize(Xva, dtype=self.cfg.RTYPE, device=utils.staging_device(Xva, self.cfg.DEVICE))
+        self.Xte = utils.tensorize(Xte, dtype=self.cfg.RTYPE, device=utils.staging_device(Xte, self.cfg.DEVICE))
 
         ## Check sizes
         if len(self.Xva):
@@ -93,12 +95,11 @@ class TrajPredDataHandler:
         if len(self.Xte):
             assert self.Xte.shape[1:] == self.Xtr.shape[1:], f"Shape of 'Xte' and 'Xtr' must match except for 0th dimension, instead found 'Xte.shape' = {self.Xte.shape} and 'Xtr.shape' = {self.Xtr.shape}"
 
-        ## Define Xscale, and normalize X data if applicable
-        self.Xscale = torch.max(torch.abs(self.Xtr)).item()
-        if self.cfg.normalize_Xdata:
-            self.Xtr = utils.scale(self.Xtr, scale=self.Xscale)
-            self.Xva = utils.scale(self.Xva, scale=self.Xscale)
-            self.Xte = utils.scale(self.Xte, scale=self.Xscale)
+        ## Define Xscale as the maximum absolute value in training data, computed as a single fused reduction
+        self.Xscale = torch.linalg.vector_norm(self.Xtr, ord=float('inf')).item()
+
+        ## Move X data to device in a single buffer, and normalize it there if applicable
+        self.Xtr, self.Xva, self.Xte = utils.to_single_buffer([self.Xtr, self.Xva, self.Xte], device=self.cfg.DEVICE, scale=self.Xscale if self.cfg.normalize_Xdata else None)
 
 
 class TrajPred:
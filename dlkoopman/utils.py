@@ -12,8 +12,9 @@ import torch
 __pdoc__ = {
     'stable_svd': False,
     'tensorize': False,
+    'staging_device': False,
     'scale': False,
-    'shift': False,
+    'to_single_buffer': False,
     'extract_item': False,
     'moving_avg': False,
     'is_torch_2': False
@@ -146,13 +147,49 @@ def set_seed(seed):
 
 
 def tensorize(arg, dtype, device) -> Any:
-    return torch.as_tensor(arg, dtype=dtype, device=device) if arg is not None else torch.tensor([], dtype=dtype, device=device)
+    if arg is None:
+        return torch.tensor([], dtype=dtype, device=device)
+    if isinstance(arg, torch.Tensor):
+        if arg.is_cuda:
+            return arg.to(dtype=dtype, device=device)
+        arg = arg.to(dtype=dtype)
+    else:
+        # Go through NumPy, which converts arrays without copying (if dtype already matches) and nested lists much faster than torch.as_tensor
+        arg = np.asarray(arg, dtype=torch.empty(0, dtype=dtype).numpy().dtype)
+        if not arg.flags.c_contiguous:
+            arg = np.ascontiguousarray(arg)
+        arg = torch.from_numpy(arg)
+    if torch.device(device).type == 'cuda':
+        # Stage in pinned host memory so that the host->device copy can be asynchronous
+        return arg.contiguous().pin_memory().to(device, non_blocking=True)
+    return arg.to(device=device)
+
+def staging_device(arg, device) -> Any:
+    """ Device on which to preprocess `arg` before moving it to `device`. Host data is preprocessed on the CPU next to its source buffer, while tensors already on CuDA stay on `device` to avoid a device->host->device round trip. """
+    return device if isinstance(arg, torch.Tensor) and arg.is_cuda else torch.device('cpu')
 
 def scale(arg, scale) -> Any:
     return arg/scale
 
-def shift(arg, shift) -> Any:
-    return arg-shift
+def to_single_buffer(args, device, scale=None) -> list:
+    """ Move tensors whose shapes match except for the 0th dimension to `device` by copying them into consecutive slices of a single pre-sized buffer, then optionally divide the whole buffer by `scale` in place. Empty tensors are moved as is. If there is nothing to scale and all tensors are already on `device`, they are returned unchanged. """
+    device = torch.device(device)
+    nonempty = [arg for arg in args if arg.numel()]
+    if not nonempty or (scale is None and all(arg.device == device for arg in args)):
+        return [arg.to(device) for arg in args]
+    buf = torch.empty((sum(len(arg) for arg in nonempty), *nonempty[0].shape[1:]), dtype=nonempty[0].dtype, device=device)
+    ret, start = [], 0
+    for arg in args:
+        if arg.numel():
+            if buf.is_cuda and not arg.is_cuda:
+                arg = arg.pin_memory() # so that the host->device copy can be asynchronous
+            ret.append(buf[start:start+len(arg)].copy_(arg, non_blocking=True))
+            start += len(arg)
+        else:
+            ret.append(arg.to(device))
+    if scale is not None:
+        buf.div_(scale)
+    return ret
 
 
 def extract_item(v) -> Any:
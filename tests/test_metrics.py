@@ -11,6 +11,60 @@ def test_anae():
         ),
         torch.tensor(275.375)
     )
+    assert torch.isclose(
+        anae(
+            ref = torch.tensor([[0.,1],[100,200]]),
+            new = torch.tensor([[0.,2],[99,199]])
+        ),
+        torch.tensor(101.5/3)
+    )
+    for dtype, small in [(torch.half, 1e-5), (torch.float, 1e-40)]: # values below the smallest normal number of the dtype
+        assert torch.isclose(
+            anae(
+                ref = torch.tensor([small,1.], dtype=dtype),
+                new = torch.tensor([2*small,1.], dtype=dtype)
+            ).float(),
+            torch.tensor(50.),
+            atol = 0.1
+        )
+    ref = torch.ones(100,100, dtype=torch.half)
+    out = anae(ref=ref, new=1.1*ref) # sum of normalized errors exceeds the half precision range
+    assert out.dtype == torch.half
+    assert torch.isclose(out.float(), torch.tensor(10.), atol=0.1)
+
+def test_anae_fast():
+    ref = torch.tensor([[0.1,1],[100,200]])
+    new = torch.tensor([[1.1,2],[99,199]])
+    assert torch.isclose(anae_fast(ref=ref, new=new), anae(ref=ref, new=new))
+    assert torch.isclose(
+        anae_fast(
+            ref = torch.tensor([[0.,1],[100,200]]),
+            new = torch.tensor([[1.,1],[100,200]]),
+            eps = 10.
+        ),
+        torch.tensor(2.5)
+    )
+    assert torch.isclose(anae_fast(ref=torch.tensor([1,2]), new=torch.tensor([2,2])), torch.tensor(50.)) # integer inputs
+
+def test_overall_anae():
+    X = torch.tensor([[0.,1],[100,200]])
+    anaes = overall_anae(
+        X = X,
+        Y = torch.tensor([[0.1,1],[100,200]]),
+        Xr = torch.tensor([[0.,2],[99,199]]),
+        Ypred = torch.tensor([[1.1,2],[99,199]]),
+        Xpred = torch.tensor([[1.,1],[100,200]])
+    )
+    assert torch.isclose(anaes['recon'], anae(ref=X, new=torch.tensor([[0.,2],[99,199]])))
+    assert torch.isclose(anaes['recon'], torch.tensor(101.5/3))
+    assert torch.isclose(anaes['lin'], torch.tensor(275.375))
+    assert torch.isclose(anaes['pred'], torch.tensor(0.))
+
+    X = torch.ones(100,100, dtype=torch.half)
+    anaes = overall_anae(X=X, Y=X, Xr=1.1*X, Ypred=0.9*X, Xpred=1.1*X) # sums of normalized errors exceed the half precision range
+    for k in ['recon', 'lin', 'pred']:
+        assert anaes[k].dtype == torch.half
+        assert torch.isclose(anaes[k].float(), torch.tensor(10.), atol=0.1)
 
 def test_naae():
     assert torch.isclose(
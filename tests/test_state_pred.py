@@ -40,6 +40,23 @@ def test_StatePredDataHandler():
     assert torch.equal(dh.Xte, torch.tensor([], dtype=cfg.RTYPE, device=cfg.DEVICE))
     assert torch.equal(dh.tte, torch.tensor([], dtype=cfg.RTYPE, device=cfg.DEVICE))
 
+    dh = StatePredDataHandler(
+        Xtr=data['Xtr'][:4], ttr=[100, 203, 298, 400]
+    )
+    assert dict(dh.dts) == {103.: 1, 95.: 1, 102.: 1}
+    assert dh.tscale == 103.
+    assert dh.tshift == 100.
+    assert torch.equal(dh.ttr, torch.tensor([0.,1.,2.,3.], dtype=cfg.RTYPE, device=cfg.DEVICE))
+
+    with pytest.raises(ValueError):
+        StatePredDataHandler(
+            Xtr=data['Xtr'][:4], ttr=[0, 1, 2, 5]
+        )
+    with pytest.raises(ValueError):
+        StatePredDataHandler(
+            Xtr=data['Xtr'][:1], ttr=[0]
+        )
+
 
 def test_StatePred():
     data = get_data()
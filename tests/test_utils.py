@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 import torch
 
 from dlkoopman.utils import *
@@ -53,3 +54,82 @@ def test_moving_avg():
         out = moving_avg([1,2], window_size=3)
     except ValueError:
         assert True
+
+
+def test_to_single_buffer():
+    Xtr = torch.tensor([[1.,2],[3,4],[5,6]])
+    Xva = torch.tensor([])
+    Xte = torch.tensor([[7.,8]])
+    _Xtr, _Xva, _Xte = to_single_buffer([Xtr, Xva, Xte], device='cpu', scale=2.)
+    assert torch.equal(_Xtr, Xtr/2.)
+    assert torch.equal(_Xva, Xva)
+    assert torch.equal(_Xte, Xte/2.)
+    assert _Xte.data_ptr() == _Xtr.data_ptr() + _Xtr.numel()*_Xtr.element_size() # consecutive slices of one buffer
+    assert torch.equal(Xtr, torch.tensor([[1.,2],[3,4],[5,6]])) # inputs are not modified
+
+    out = to_single_buffer([Xtr, Xva, Xte], device='cpu') # nothing to scale or move
+    assert all(o is arg for o, arg in zip(out, [Xtr, Xva, Xte]))
+
+    out = to_single_buffer([torch.tensor([]), torch.tensor([])], device='cpu', scale=2.)
+    assert all(torch.equal(o, torch.tensor([])) for o in out)
+
+
+def test_tensorize():
+    ## None
+    out = tensorize(None, dtype=torch.float, device='cpu')
+    assert torch.equal(out, torch.tensor([], dtype=torch.float))
+
+    ## NumPy arrays
+    arr = np.array([[1.,2],[3,4]], dtype=np.float32)
+    out = tensorize(arr, dtype=torch.float, device='cpu')
+    assert out.dtype == torch.float and out.shape == (2,2)
+    assert out.data_ptr() == arr.ctypes.data # no copy if dtype matches
+    out = tensorize(arr, dtype=torch.double, device='cpu')
+    assert out.dtype == torch.double and torch.equal(out, torch.tensor([[1.,2],[3,4]], dtype=torch.double))
+    out = tensorize(arr.T, dtype=torch.float, device='cpu') # non-contiguous
+    assert out.is_contiguous() and torch.equal(out, torch.tensor([[1.,3],[2,4]]))
+    out = tensorize(np.array([]), dtype=torch.float, device='cpu')
+    assert out.shape == (0,)
+
+    ## Lists, ranges and scalars
+    out = tensorize([[1,2],[3,4]], dtype=torch.half, device='cpu')
+    assert out.dtype == torch.half and torch.equal(out, torch.tensor([[1.,2],[3,4]], dtype=torch.half))
+    out = tensorize(range(3), dtype=torch.float, device='cpu')
+    assert torch.equal(out, torch.tensor([0.,1,2]))
+    out = tensorize(3, dtype=torch.float, device='cpu')
+    assert out.shape == () and out.item() == 3.
+
+    assert staging_device(arr, device=torch.device('cpu')) == torch.device('cpu')
+
+    ## CPU tensors
+    t = torch.tensor([1.,2])
+    out = tensorize(t, dtype=torch.float, device='cpu')
+    assert out.data_ptr() == t.data_ptr()
+    out = tensorize(t, dtype=torch.double, device='cpu')
+    assert out.dtype == torch.double and torch.equal(out, t.double())
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="Requires CuDA")
+def test_tensorize_cuda():
+    ## Host data is staged in pinned memory and copied to the device
+    out = tensorize(np.array([1.,2]), dtype=torch.float, device='cuda')
+    assert out.is_cuda and out.dtype == torch.float
+    assert torch.equal(out.cpu(), torch.tensor([1.,2]))
+    out = tensorize(torch.tensor([1.,2]), dtype=torch.double, device='cuda')
+    assert out.is_cuda and out.dtype == torch.double
+
+    ## CUDA tensors stay on the device
+    t = torch.tensor([1.,2], device='cuda')
+    out = tensorize(t, dtype=torch.float, device='cuda')
+    assert out.data_ptr() == t.data_ptr()
+
+    assert staging_device(t, device=torch.device('cuda')) == torch.device('cuda')
+    assert staging_device(t.cpu(), device=torch.device('cuda')) == torch.device('cpu')
+
+    _Xtr, _Xva, _Xte = to_single_buffer([torch.tensor([[1.,2]]), torch.tensor([]), torch.tensor([[3.,4]])], device='cuda', scale=2.)
+    assert _Xtr.is_cuda and _Xva.is_cuda and _Xte.is_cuda
+    assert torch.equal(torch.cat([_Xtr, _Xte]).cpu(), torch.tensor([[0.5,1],[1.5,2]]))
+    assert _Xte.data_ptr() == _Xtr.data_ptr() + _Xtr.numel()*_Xtr.element_size()
+
+    out = tensorize(None, dtype=torch.float, device='cuda')
+    assert out.is_cuda and out.numel() == 0